@@ -3,23 +3,37 @@ FastAPI REST API for Pet Shop ordering service.
 Provides endpoints for browsing pets, creating orders, and checking order status.
 """
 
+import asyncio
 import os
+import secrets
 import time
-import uuid
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Annotated, List, Optional
 
-from fastapi import FastAPI, HTTPException, Request, status
+from fastapi import FastAPI, HTTPException, Query, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-
-from database import close_mongo_connection, connect_to_mongo, get_database
+from pymongo.errors import DuplicateKeyError
+
+from cache import (
+    cache_get,
+    cache_set,
+    close_redis_connection,
+    connect_to_redis,
+    invalidate_pets_cache,
+    pet_key,
+    pets_query_key,
+)
+from database import close_mongo_connection, connect_to_mongo, get_database, is_seeded, seed_failed
+from env import ensure_loaded
 from models import (
+    ORDER_ITEMS_ADAPTER,
     BrowsePetsInput,
     CheckOrderStatusInput,
     CustomerInfo,
+    HealthResponse,
+    MessageResponse,
     Order,
-    OrderItem,
     OrderStatus,
     OrderStatusResponse,
     Pet,
@@ -43,6 +57,52 @@ except ImportError:
     OBSERVABILITY_ENABLED = False
     print("⚠️  Observability modules not available. Install opentelemetry packages for full monitoring.")
 
+ensure_loaded()
+
+
+# MongoDB projections limiting fetched fields to what each endpoint returns
+PET_PROJECTION = {"_id": 0, "reserved_by": 0}
+ORDER_PET_PROJECTION = {"_id": 0, "id": 1, "name": 1, "price": 1}
+ORDER_PROJECTION = {"_id": 0}
+ORDER_STATUS_PROJECTION = {
+    "_id": 0,
+    "id": 1,
+    "status": 1,
+    "customer.name": 1,
+    "total_amount": 1,
+    "created_at": 1,
+    "items": 1,
+}
+
+# Fresh order IDs drawn before giving up when each one collides with an existing order
+ORDER_ID_ATTEMPTS = 3
+
+
+# Collections are bound once at startup in lifespan
+pets_collection = None
+orders_collection = None
+
+
+def _pet_from_db(pet_data: dict) -> Pet:
+    """Build a Pet from a trusted database document without re-running validation"""
+    return Pet.model_construct(**pet_data)
+
+
+def _order_from_db(order_data: dict) -> Order:
+    """
+    Build an Order from a trusted database document.
+
+    The order and customer skip validation via model_construct; items are validated through
+    ORDER_ITEMS_ADAPTER because pydantic dataclasses have no model_construct.
+    """
+    return Order.model_construct(
+        **{
+            **order_data,
+            "customer": CustomerInfo.model_construct(**order_data["customer"]),
+            "items": ORDER_ITEMS_ADAPTER.validate_python(order_data["items"]),
+        }
+    )
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -51,13 +111,22 @@ async def lifespan(app: FastAPI):
     if OBSERVABILITY_ENABLED:
         init_observability()
     await connect_to_mongo()
+
+    global pets_collection, orders_collection
+    db = await get_database()
+    pets_collection = db.pets
+    orders_collection = db.orders
+
+    await connect_to_redis()
     yield
     # Shutdown
+    await close_redis_connection()
     await close_mongo_connection()
 
 
-# Initialize FastAPI app
 # Initialize FastAPI app with enhanced OpenAPI documentation
+# Keep the default response class: with a response_model set, FastAPI serializes straight to
+# JSON bytes through pydantic-core, which is faster than a custom (e.g. orjson) response class.
 app = FastAPI(
     title="Pet Paradise Shop API",
     description="""
@@ -77,7 +146,7 @@ This API provides endpoints for:
 
 ### Technology Stack
 - **Framework**: FastAPI
-- **Database**: MongoDB with Motor (async)
+- **Database**: MongoDB with PyMongo (async)
 - **Validation**: Pydantic v2
 - **Observability**: OpenTelemetry, Prometheus, Jaeger
 
@@ -111,44 +180,56 @@ This API provides endpoints for:
     ],
 )
 
-# Add CORS middleware
-# WARNING: This configuration allows all origins with credentials for development.
-# For production, specify explicit allowed origins:
-# allow_origins=["https://yourdomain.com", "https://www.yourdomain.com"]
-# Or remove allow_credentials if using wildcard origins.
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Change to specific origins in production
-    allow_credentials=True,  # Set to False if using wildcard origins in production
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
+# Add CORS middleware only when browsers call the API cross-origin; the chat app calls it
+# server-side, so same-origin deployments skip the per-request CORS checks entirely.
+# Set CORS_ALLOW_ORIGINS to an explicit comma-separated allowlist in production; without one (or with "*")
+# any origin is allowed, but never with credentials.
+if os.getenv("ENABLE_CORS", "false").lower() == "true":
+    cors_origins = [origin.strip() for origin in os.getenv("CORS_ALLOW_ORIGINS", "").split(",") if origin.strip()]
+    cors_origins = cors_origins or ["*"]
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=cors_origins,
+        allow_credentials="*" not in cors_origins,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
 
-# Middleware for request tracking
-@app.middleware("http")
-async def track_requests(request: Request, call_next):
-    """Middleware to track requests and record metrics."""
-    if OBSERVABILITY_ENABLED:
-        increment_active_requests()
 
-    start_time = time.time()
+class TrackRequestsMiddleware:
+    """Pure ASGI middleware to track requests and record metrics."""
 
-    try:
-        response = await call_next(request)
-        duration = time.time() - start_time
+    def __init__(self, app):
+        self.app = app
 
-        if OBSERVABILITY_ENABLED:
-            record_request(
-                method=request.method, endpoint=request.url.path, status=response.status_code, duration=duration
-            )
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
 
-        return response
-    finally:
-        if OBSERVABILITY_ENABLED:
+        increment_active_requests()
+        start_time = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                record_request(
+                    method=scope["method"],
+                    endpoint=scope["path"],
+                    status=message["status"],
+                    duration=time.perf_counter() - start_time,
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
             decrement_active_requests()
 
 
+# Middleware for request tracking
+if OBSERVABILITY_ENABLED:
+    app.add_middleware(TrackRequestsMiddleware)
+
+
 @app.get("/", tags=["health"])
 async def root():
     """Root endpoint with API information"""
@@ -157,20 +238,19 @@ async def root():
         "version": "1.0.0",
         "documentation": "/docs",
         "openapi_json": "/openapi.json",
-        "endpoints": {"pets": "/pets", "orders": "/orders", "health": "/health"},
+        "endpoints": {"pets": "/pets", "orders": "/orders", "health": "/health", "ready": "/ready"},
     }
 
 
-@app.get("/health", tags=["health"])
+@app.get("/health", response_model=HealthResponse, tags=["health"])
 async def health_check():
     """
     Health check endpoint
 
     Returns the health status of the API and database connection.
     """
-    db = await get_database()
     try:
-        await db.command("ping")
+        await pets_collection.database.command("ping")
         return {"status": "healthy", "database": "connected"}
     except Exception as e:
         raise HTTPException(
@@ -178,13 +258,27 @@ async def health_check():
         )
 
 
+@app.get("/ready", response_model=HealthResponse, tags=["health"])
+async def readiness_check():
+    """
+    Readiness check endpoint
+
+    Returns 503 until the initial sample data seeding has completed, or if it failed.
+    """
+    if seed_failed():
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Initial data seeding failed")
+    if not is_seeded():
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Initial data seeding in progress")
+    return {"status": "ready", "database": "seeded"}
+
+
 @app.get("/pets", response_model=PetInventoryResponse, tags=["pets"])
 async def get_pets(
-    pet_type: Optional[str] = None,
-    max_price: Optional[float] = None,
-    min_age_months: Optional[int] = None,
-    max_age_months: Optional[int] = None,
-    available_only: bool = True,
+    pet_type: Annotated[Optional[str], Query()] = None,
+    max_price: Annotated[Optional[float], Query(ge=0)] = None,
+    min_age_months: Annotated[Optional[int], Query(ge=0)] = None,
+    max_age_months: Annotated[Optional[int], Query(ge=0)] = None,
+    available_only: Annotated[bool, Query()] = True,
 ):
     """
     Get list of pets with optional filters.
@@ -196,9 +290,6 @@ async def get_pets(
     - max_age_months: Maximum age in months
     - available_only: Only show available pets (default: True)
     """
-    db = await get_database()
-    pets_collection = db.pets
-
     # Build query filter
     query = {}
     if available_only:
@@ -212,18 +303,26 @@ async def get_pets(
     if max_age_months is not None:
         query.setdefault("age_months", {})["$lte"] = max_age_months
 
+    # Serve from cache when possible; cached entries are already-serialized responses
+    cache_key = pets_query_key(query)
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
     # Query database
-    cursor = pets_collection.find(query)
+    cursor = pets_collection.find(query, projection=PET_PROJECTION)
     pets_list = await cursor.to_list(length=100)
 
-    # Convert to Pydantic models
-    pets = [Pet(**pet) for pet in pets_list]
+    # Convert to Pydantic models (documents were validated when written)
+    pets = [_pet_from_db(pet) for pet in pets_list]
 
     # Record inventory metrics
     if OBSERVABILITY_ENABLED:
-        record_pet_inventory(pet_type if pet_type else "all", len(pets))
+        record_pet_inventory(pet_type.lower() if pet_type else "all", len(pets))
 
-    return PetInventoryResponse(pets=pets, total=len(pets), filtered_by_type=pet_type if pet_type else None)
+    response = PetInventoryResponse(pets=pets, total=len(pets), filtered_by_type=pet_type if pet_type else None)
+    await cache_set(cache_key, response.model_dump_json())
+    return response
 
 
 @app.get("/pets/{pet_id}", response_model=Pet, tags=["pets"])
@@ -237,14 +336,31 @@ async def get_pet_by_id(pet_id: str):
     Returns:
     - Pet details including name, type, price, age, and availability
     """
-    db = await get_database()
-    pets_collection = db.pets
+    cached = await cache_get(pet_key(pet_id))
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
 
-    pet_data = await pets_collection.find_one({"id": pet_id})
+    pet_data = await pets_collection.find_one({"id": pet_id}, projection=PET_PROJECTION)
     if not pet_data:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Pet with ID {pet_id} not found")
 
-    return Pet(**pet_data)
+    pet = _pet_from_db(pet_data)
+    await cache_set(pet_key(pet_id), pet.model_dump_json())
+    return pet
+
+
+async def _release_pets(order_id: str, pet_ids: List[str]) -> None:
+    """
+    Make the requested pets reserved by ``order_id`` available again after a failed order.
+
+    Scoped to ``pet_ids`` because a colliding order ID may belong to an existing order whose
+    pets carry the same ``reserved_by`` stamp and must stay sold.
+    """
+    await pets_collection.update_many(
+        {"id": {"$in": pet_ids}, "reserved_by": order_id},
+        {"$set": {"available": True}, "$unset": {"reserved_by": ""}},
+    )
+    await invalidate_pets_cache()
 
 
 @app.post("/orders", response_model=Order, status_code=status.HTTP_201_CREATED, tags=["orders"])
@@ -262,34 +378,34 @@ async def create_order(order_input: PlaceOrderInput):
     Returns:
     - Created order with order ID and details
 
-    Note: Uses find_one_and_update for atomic pet availability updates to prevent race conditions.
+    Note: Availability is validated with one batched query and reserved with one conditional
+    update, so concurrent orders cannot claim the same pet.
     """
-    db = await get_database()
-    pets_collection = db.pets
-    orders_collection = db.orders
+    pet_ids = order_input.pet_ids
 
-    # Atomically check and mark pets as unavailable to prevent race conditions
-    order_items = []
-    total_amount = 0.0
+    # Validate availability of every requested pet with a single query
+    cursor = pets_collection.find({"id": {"$in": pet_ids}, "available": True}, projection=ORDER_PET_PROJECTION)
+    pets_found = await cursor.to_list(length=len(pet_ids))
+    pets_by_id = {pet["id"]: pet for pet in pets_found}
 
-    for pet_id in order_input.pet_ids:
-        # Use find_one_and_update to atomically check availability and mark as unavailable
-        pet_data = await pets_collection.find_one_and_update(
-            {"id": pet_id, "available": True},
-            {"$set": {"available": False}},
-            return_document=False,  # Return the document before update
+    missing = set(pet_ids) - pets_by_id.keys()
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Pets not available: {', '.join(sorted(missing))}"
         )
-        if not pet_data:
-            # Rollback: mark previously reserved pets as available again
-            for item in order_items:
-                await pets_collection.update_one({"id": item.pet_id}, {"$set": {"available": True}})
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Pet {pet_id} is not available")
 
-        order_items.append(OrderItem(pet_id=pet_data["id"], pet_name=pet_data["name"], price=pet_data["price"]))
-        total_amount += pet_data["price"]
+    order_items = ORDER_ITEMS_ADAPTER.validate_python(
+        [
+            {
+                "pet_id": pets_by_id[pet_id]["id"],
+                "pet_name": pets_by_id[pet_id]["name"],
+                "price": pets_by_id[pet_id]["price"],
+            }
+            for pet_id in pet_ids
+        ]
+    )
+    total_amount = sum(item.price for item in order_items)
 
-    # Create order
-    order_id = f"ORD-{uuid.uuid4().hex[:8].upper()}"
     customer = CustomerInfo(
         name=order_input.customer_name,
         email=order_input.customer_email,
@@ -297,18 +413,52 @@ async def create_order(order_input: PlaceOrderInput):
         address=order_input.delivery_address,
     )
 
-    order = Order(
-        id=order_id,
-        customer=customer,
-        items=order_items,
-        total_amount=total_amount,
-        status=OrderStatus.PENDING,
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc),
-    )
+    # Create order. Order IDs are short random tokens, so a collision with an existing order is
+    # possible; the unique index rejects it and a fresh ID is drawn.
+    for _ in range(ORDER_ID_ATTEMPTS):
+        order_id = f"ORD-{secrets.token_hex(4).upper()}"
+        now = datetime.now(timezone.utc)
+        order = Order(
+            id=order_id,
+            customer=customer,
+            items=order_items,
+            total_amount=total_amount,
+            status=OrderStatus.PENDING,
+            created_at=now,
+            updated_at=now,
+        )
 
-    # Save to database
-    await orders_collection.insert_one(order.model_dump())
+        # Save the order and reserve all pets concurrently. The reservation is one conditional write;
+        # each pet is stamped with the order ID so a failed insert or a partial reservation (lost race
+        # with a concurrent order) can release exactly what it claimed.
+        inserted, reservation = await asyncio.gather(
+            orders_collection.insert_one(order.model_dump()),
+            pets_collection.update_many(
+                {"id": {"$in": pet_ids}, "available": True}, {"$set": {"available": False, "reserved_by": order_id}}
+            ),
+            return_exceptions=True,
+        )
+        if isinstance(inserted, BaseException) or isinstance(reservation, BaseException):
+            # Rollback: undo whichever half succeeded before retrying or surfacing the error
+            if not isinstance(inserted, BaseException):
+                await orders_collection.delete_one({"id": order_id})
+            await _release_pets(order_id, pet_ids)
+            if isinstance(inserted, DuplicateKeyError) and not isinstance(reservation, BaseException):
+                continue
+            raise inserted if isinstance(inserted, BaseException) else reservation
+        break
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Could not allocate a unique order ID"
+        )
+
+    if reservation.modified_count != len(pet_ids):
+        # Rollback: discard the order and mark the pets it reserved as available again
+        await asyncio.gather(orders_collection.delete_one({"id": order_id}), _release_pets(order_id, pet_ids))
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="One or more pets are no longer available")
+
+    # Pet availability changed, so cached inventory is stale
+    await invalidate_pets_cache()
 
     # Record order metrics
     if OBSERVABILITY_ENABLED:
@@ -328,14 +478,11 @@ async def get_order(order_id: str):
     Returns:
     - Complete order details including customer info and items
     """
-    db = await get_database()
-    orders_collection = db.orders
-
-    order_data = await orders_collection.find_one({"id": order_id})
+    order_data = await orders_collection.find_one({"id": order_id}, projection=ORDER_PROJECTION)
     if not order_data:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Order {order_id} not found")
 
-    return Order(**order_data)
+    return _order_from_db(order_data)
 
 
 @app.get("/orders/{order_id}/status", response_model=OrderStatusResponse, tags=["orders"])
@@ -349,25 +496,21 @@ async def get_order_status(order_id: str):
     Returns:
     - Current order status and summary information
     """
-    db = await get_database()
-    orders_collection = db.orders
-
-    order_data = await orders_collection.find_one({"id": order_id})
+    order_data = await orders_collection.find_one({"id": order_id}, projection=ORDER_STATUS_PROJECTION)
     if not order_data:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Order {order_id} not found")
 
-    order = Order(**order_data)
     return OrderStatusResponse(
-        order_id=order.id,
-        status=order.status,
-        customer_name=order.customer.name,
-        total_amount=order.total_amount,
-        created_at=order.created_at,
-        items_count=len(order.items),
+        order_id=order_data["id"],
+        status=order_data["status"],
+        customer_name=order_data["customer"]["name"],
+        total_amount=order_data["total_amount"],
+        created_at=order_data["created_at"],
+        items_count=len(order_data["items"]),
     )
 
 
-@app.put("/orders/{order_id}/status", tags=["orders"])
+@app.put("/orders/{order_id}/status", response_model=MessageResponse, tags=["orders"])
 async def update_order_status(order_id: str, new_status: OrderStatus):
     """
     Update order status (for testing/admin purposes)
@@ -379,9 +522,6 @@ async def update_order_status(order_id: str, new_status: OrderStatus):
     Returns:
     - Success message
     """
-    db = await get_database()
-    orders_collection = db.orders
-
     result = await orders_collection.update_one(
         {"id": order_id}, {"$set": {"status": new_status.value, "updated_at": datetime.now(timezone.utc)}}
     )
@@ -398,4 +538,5 @@ if __name__ == "__main__":
     host = os.getenv("API_HOST", "0.0.0.0")
     port = int(os.getenv("API_PORT", "8000"))
 
-    uvicorn.run(app, host=host, port=port)
+    # loop="auto" runs on uvloop when installed (see requirements.txt), so every Mongo/Redis round trip uses libuv
+    uvicorn.run(app, host=host, port=port, loop="auto")
@@ -3,26 +3,50 @@ Chainlit chat application for Pet Shop ordering and support.
 Uses Azure OpenAI with structured outputs and tool calling.
 """
 
-import json
+import asyncio
 import os
 
 import chainlit as cl
-from dotenv import load_dotenv
+import httpx
+import orjson
 from openai import AsyncAzureOpenAI
 
-from tools import TOOLS_DEFINITIONS, TOOLS_MAP
+from env import ensure_loaded
+from tools import TOOLS_DEFINITIONS, TOOLS_MAP, close_client
 
-load_dotenv()
+# Import observability
+try:
+    from observability import init_observability
+
+    OBSERVABILITY_ENABLED = True
+except ImportError:
+    OBSERVABILITY_ENABLED = False
+
+ensure_loaded()
+
+# uvloop is deliberately not installed here: chainlit applies nest_asyncio for re-entrant
+# run_until_complete calls, which only works on the stock asyncio event loop.
+
+# Shared HTTP client for Azure OpenAI with HTTP/2 multiplexing and keep-alive connection reuse
+http_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=30.0),
+    timeout=httpx.Timeout(60.0, connect=5.0),
+)
 
 # Initialize Azure OpenAI client
 client = AsyncAzureOpenAI(
     api_key=os.getenv("AZURE_OPENAI_API_KEY"),
     api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview"),
     azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+    http_client=http_client,
 )
 
 DEPLOYMENT_NAME = os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4")
 
+# Names of the tools the assistant is allowed to call
+VALID_TOOLS = frozenset(TOOLS_MAP)
+
 # System prompt for the pet shop assistant
 SYSTEM_PROMPT = """You are a helpful and friendly pet shop assistant. Your role is to help customers:
 
@@ -46,12 +70,35 @@ Available pet types: dog, cat, bird, fish, rabbit, hamster
 
 Always be helpful and make the shopping experience enjoyable!"""
 
+# Shared by every chat session; message histories must never mutate it
+SYSTEM_MSG = {"role": "system", "content": SYSTEM_PROMPT}
+
+
+async def execute_tool_call(tool_call) -> dict:
+    """Execute a single tool call requested by the assistant (the tool name must be valid)"""
+    function_args = orjson.loads(tool_call.function.arguments)
+    return await TOOLS_MAP[tool_call.function.name](**function_args)
+
+
+@cl.on_app_startup
+async def startup():
+    """Initialize observability for the chat process"""
+    if OBSERVABILITY_ENABLED:
+        init_observability()
+
+
+@cl.on_app_shutdown
+async def shutdown():
+    """Close the shared Azure OpenAI and pet shop API HTTP clients"""
+    await client.close()
+    await close_client()
+
 
 @cl.on_chat_start
 async def start():
     """Initialize the chat session"""
     # Initialize message history
-    cl.user_session.set("message_history", [{"role": "system", "content": SYSTEM_PROMPT}])
+    cl.user_session.set("message_history", [SYSTEM_MSG])
 
     # Send welcome message
     welcome_message = """# 🐾 Welcome to Pet Paradise! 🐾
@@ -122,50 +169,49 @@ async def main(message: cl.Message):
                 }
             )
 
-            # Execute each tool call
+            # Show which tools are being called
             for tool_call in assistant_message.tool_calls:
-                function_name = tool_call.function.name
-                function_args = json.loads(tool_call.function.arguments)
+                current_content += f"🔧 Using tool: {tool_call.function.name}...\n\n"
+            await response_message.update()
 
-                # Show which tool is being called
-                current_content += f"🔧 Using tool: {function_name}...\n\n"
-                await response_message.update()
+            # Validate tool names once, then execute the valid calls concurrently
+            valid_calls = [tc for tc in assistant_message.tool_calls if tc.function.name in VALID_TOOLS]
+            results = await asyncio.gather(*(execute_tool_call(tc) for tc in valid_calls), return_exceptions=True)
+            tool_results = {tc.id: result for tc, result in zip(valid_calls, results)}
 
-                # Execute the tool
-                if function_name in TOOLS_MAP:
-                    function_to_call = TOOLS_MAP[function_name]
-                    tool_response = await function_to_call(**function_args)
-
-                    # Add tool response to message history
-                    message_history.append(
-                        {
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "name": function_name,
-                            "content": json.dumps(tool_response),
-                        }
-                    )
+            # Append tool responses in the original call order
+            for tool_call in assistant_message.tool_calls:
+                if tool_call.id not in tool_results:
+                    tool_response = {"error": f"Unknown function: {tool_call.function.name}"}
+                elif isinstance(tool_results[tool_call.id], Exception):
+                    tool_response = {"error": f"Tool {tool_call.function.name} failed: {tool_results[tool_call.id]}"}
                 else:
-                    # Unknown function
-                    message_history.append(
-                        {
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "name": function_name,
-                            "content": json.dumps({"error": f"Unknown function: {function_name}"}),
-                        }
-                    )
-
-            # Make a second API call to get the final response
-            second_response = await client.chat.completions.create(
-                model=DEPLOYMENT_NAME, messages=message_history, temperature=0.7, max_tokens=1500
+                    tool_response = tool_results[tool_call.id]
+
+                # Add tool response to message history
+                message_history.append(
+                    {
+                        "role": "tool",
+                        "tool_call_id": tool_call.id,
+                        "name": tool_call.function.name,
+                        "content": orjson.dumps(tool_response).decode(),
+                    }
+                )
+
+            # Make a second API call and stream the final response token by token
+            stream = await client.chat.completions.create(
+                model=DEPLOYMENT_NAME, messages=message_history, temperature=0.7, max_tokens=1500, stream=True
             )
 
-            final_message = second_response.choices[0].message
-            current_content = final_message.content
+            response_message.content = ""
+            async for chunk in stream:
+                # Azure may send chunks without choices (e.g. content filter results)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    await response_message.stream_token(chunk.choices[0].delta.content)
+            current_content = response_message.content
 
             # Add final response to history
-            message_history.append({"role": "assistant", "content": final_message.content})
+            message_history.append({"role": "assistant", "content": current_content})
         else:
             # No tool calls, just use the response directly
             current_content = assistant_message.content
@@ -0,0 +1,102 @@
+"""
+Redis cache configuration for the read-heavy pet inventory endpoints.
+Caching is optional: it is enabled only when REDIS_URL is set and the redis package is installed.
+"""
+
+import hashlib
+import json
+import os
+from typing import Optional
+
+from env import ensure_loaded
+
+try:
+    import redis.asyncio as redis
+    from redis.exceptions import RedisError
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+ensure_loaded()
+
+PETS_CACHE_PREFIX = "pets:"
+PETS_CACHE_TTL = int(os.getenv("PETS_CACHE_TTL", "60"))
+
+
+class Cache:
+    """Cache connection manager"""
+
+    client = None
+
+
+cache = Cache()
+
+
+async def connect_to_redis():
+    """Establish connection to Redis if configured"""
+    redis_url = os.getenv("REDIS_URL")
+    if not redis_url:
+        return
+    if not REDIS_AVAILABLE:
+        print("⚠️  REDIS_URL is set but the redis package is not installed. Caching disabled.")
+        return
+
+    try:
+        # Short timeouts so a hung Redis degrades to a cache miss instead of stalling requests
+        cache.client = redis.from_url(redis_url, socket_connect_timeout=0.2, socket_timeout=0.2)
+        await cache.client.ping()
+        print("✓ Connected to Redis cache")
+    except RedisError as e:
+        print(f"⚠️  Failed to connect to Redis, caching disabled: {e}")
+        cache.client = None
+
+
+async def close_redis_connection():
+    """Close Redis connection"""
+    if cache.client:
+        await cache.client.aclose()
+        print("✓ Closed Redis connection")
+
+
+def pets_query_key(query: dict) -> str:
+    """Build the cache key for a pet inventory query"""
+    digest = hashlib.blake2b(json.dumps(query, sort_keys=True).encode(), digest_size=8).hexdigest()
+    return f"{PETS_CACHE_PREFIX}query:{digest}"
+
+
+def pet_key(pet_id: str) -> str:
+    """Build the cache key for a single pet"""
+    return f"{PETS_CACHE_PREFIX}id:{pet_id}"
+
+
+async def cache_get(key: str) -> Optional[bytes]:
+    """Get a cached value, treating cache errors as a miss"""
+    if cache.client is None:
+        return None
+    try:
+        return await cache.client.get(key)
+    except RedisError:
+        return None
+
+
+async def cache_set(key: str, value: str, ttl: int = PETS_CACHE_TTL):
+    """Cache a value with a TTL, ignoring cache errors"""
+    if cache.client is None:
+        return
+    try:
+        await cache.client.setex(key, ttl, value)
+    except RedisError:
+        pass
+
+
+async def invalidate_pets_cache():
+    """Drop every cached pet inventory entry"""
+    if cache.client is None:
+        return
+    try:
+        keys = [key async for key in cache.client.scan_iter(match=f"{PETS_CACHE_PREFIX}*", count=500)]
+        if keys:
+            await cache.client.delete(*keys)
+    except RedisError:
+        pass
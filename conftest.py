@@ -0,0 +1,99 @@
+"""
+Shared pytest fixtures for the pet shop validation tests.
+Sample models are frozen, so one instance per session is safe to share.
+"""
+
+import os
+import uuid
+
+import httpx
+import pytest
+import pytest_asyncio
+from pymongo.errors import ConnectionFailure
+
+from models import CustomerInfo, Order, OrderItem, OrderStatus, Pet, PetType
+
+# Tests export no traces or metrics; must be set before observability is first imported
+os.environ.setdefault("ENABLE_OBSERVABILITY", "false")
+
+
+@pytest.fixture(scope="session")
+def sample_pet():
+    """A valid available dog"""
+    return Pet(
+        id="test001",
+        name="Test Dog",
+        type=PetType.DOG,
+        description="A test dog",
+        price=100.0,
+        age_months=6,
+        available=True,
+    )
+
+
+@pytest.fixture(scope="session")
+def sample_customer():
+    """A valid customer"""
+    return CustomerInfo(name="Test Customer", email="test@example.com", phone="555-0123", address="123 Test St")
+
+
+@pytest.fixture(scope="session")
+def sample_order_item(sample_pet):
+    """An order item for the sample pet"""
+    return OrderItem(pet_id=sample_pet.id, pet_name=sample_pet.name, price=sample_pet.price)
+
+
+@pytest.fixture(scope="session")
+def sample_order(sample_customer, sample_order_item):
+    """A pending order containing the sample order item"""
+    return Order(
+        id="ORD-TEST",
+        customer=sample_customer,
+        items=[sample_order_item],
+        total_amount=sample_order_item.price,
+        status=OrderStatus.PENDING,
+    )
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def api_app():
+    """
+    The API app with its lifespan running against MONGODB_URI; skips the test when MongoDB is unreachable.
+
+    Orders placed by the tests reserve pets permanently, so the app runs against a throwaway
+    database that is dropped on teardown rather than the shared MONGODB_DATABASE. Each
+    pytest-xdist worker gets its own, so parallel order tests never race for the same pet.
+    """
+    import api
+    from database import db
+
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    database_name = f"petshop_test_{worker}_{uuid.uuid4().hex}"
+    previous_database = os.environ.get("MONGODB_DATABASE")
+    os.environ["MONGODB_DATABASE"] = database_name
+
+    lifespan = api.lifespan(api.app)
+    try:
+        await lifespan.__aenter__()
+    except ConnectionFailure as e:
+        pytest.skip(f"MongoDB is not available ({type(e).__name__})")
+    finally:
+        if previous_database is None:
+            del os.environ["MONGODB_DATABASE"]
+        else:
+            os.environ["MONGODB_DATABASE"] = previous_database
+    await db.seed_task
+    yield api.app
+    await db.client.drop_database(database_name)
+    await lifespan.__aexit__(None, None, None)
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def tool_client(api_app):
+    """Route the tools' shared HTTP client to the in-process API, with no socket traffic"""
+    import tools
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api_app), base_url="http://test") as client:
+        tools._client = client
+        yield client
+        tools._client = None
@@ -2,20 +2,25 @@
 MongoDB database configuration and connection management.
 """
 
+import asyncio
 import os
+from datetime import timezone
+from typing import Tuple
 
-from dotenv import load_dotenv
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import AsyncMongoClient, UpdateOne
 from pymongo.errors import ConnectionFailure
 
-load_dotenv()
+from env import ensure_loaded
+
+ensure_loaded()
 
 
 class Database:
     """Database connection manager"""
 
-    client: AsyncIOMotorClient = None
+    client: AsyncMongoClient = None
     db = None
+    seed_task: asyncio.Task = None
 
 
 db = Database()
@@ -27,25 +32,55 @@ async def connect_to_mongo():
     database_name = os.getenv("MONGODB_DATABASE", "petshop")
 
     try:
-        db.client = AsyncIOMotorClient(mongodb_uri)
+        db.client = AsyncMongoClient(
+            mongodb_uri,
+            maxPoolSize=int(os.getenv("MONGO_MAX_POOL", "200")),
+            minPoolSize=int(os.getenv("MONGO_MIN_POOL", "10")),
+            maxIdleTimeMS=300_000,
+            waitQueueTimeoutMS=5_000,
+            serverSelectionTimeoutMS=3_000,
+            retryWrites=True,
+            compressors="zstd,zlib",
+            # Decode BSON datetimes straight into UTC-aware datetimes, matching how orders are written
+            tz_aware=True,
+            tzinfo=timezone.utc,
+        )
         db.db = db.client[database_name]
 
-        # Test the connection
-        await db.client.admin.command("ping")
+        # The first real operation doubles as the connectivity check, so no separate ping round trip
+        await create_indexes()
         print(f"✓ Connected to MongoDB: {database_name}")
 
-        # Initialize collections with sample data if empty
-        await initialize_sample_data()
+        # Seed sample data in the background so the API can accept traffic immediately
+        db.seed_task = asyncio.create_task(initialize_sample_data())
+        db.seed_task.add_done_callback(_report_seed_failure)
 
     except ConnectionFailure as e:
         print(f"✗ Failed to connect to MongoDB: {e}")
         raise
 
 
+async def create_indexes():
+    """Create indexes backing the filters used by the API endpoints (idempotent)"""
+    # Builds are independent, so issue them concurrently; pets.id also serves the seed upserts
+    await asyncio.gather(
+        db.db.pets.create_index("id", unique=True),
+        db.db.pets.create_index([("available", 1), ("type", 1), ("price", 1)]),
+        db.db.pets.create_index("age_months"),
+        db.db.orders.create_index("id", unique=True),
+    )
+
+
 async def close_mongo_connection():
     """Close MongoDB connection"""
+    if db.seed_task and not db.seed_task.done():
+        db.seed_task.cancel()
+        try:
+            await db.seed_task
+        except asyncio.CancelledError:
+            pass
     if db.client:
-        db.client.close()
+        await db.client.close()
         print("✓ Closed MongoDB connection")
 
 
@@ -54,115 +89,136 @@ async def get_database():
     return db.db
 
 
+def _report_seed_failure(task: asyncio.Task):
+    """Surface a background seeding error, which would otherwise go unobserved"""
+    if not task.cancelled() and task.exception() is not None:
+        print(f"✗ Failed to seed sample data: {task.exception()!r}")
+
+
+def is_seeded() -> bool:
+    """Whether initial sample data seeding has completed successfully"""
+    task = db.seed_task
+    return task is not None and task.done() and not task.cancelled() and task.exception() is None
+
+
+def seed_failed() -> bool:
+    """Whether initial sample data seeding stopped without completing (error or cancellation)"""
+    task = db.seed_task
+    return task is not None and task.done() and (task.cancelled() or task.exception() is not None)
+
+
+# Sample inventory seeded on startup, built once at import
+_SAMPLE_PETS: Tuple[dict, ...] = (
+    {
+        "id": "pet001",
+        "name": "Golden Retriever Puppy",
+        "type": "dog",
+        "description": "Friendly and energetic Golden Retriever puppy, great with families and children. Well-socialized and vaccinated.",
+        "price": 1200.00,
+        "age_months": 3,
+        "available": True,
+        "image_url": "https://example.com/golden-retriever.jpg",
+    },
+    {
+        "id": "pet002",
+        "name": "British Shorthair Kitten",
+        "type": "cat",
+        "description": "Adorable British Shorthair kitten with beautiful blue-gray coat. Calm and affectionate temperament.",
+        "price": 800.00,
+        "age_months": 2,
+        "available": True,
+        "image_url": "https://example.com/british-shorthair.jpg",
+    },
+    {
+        "id": "pet003",
+        "name": "Beagle",
+        "type": "dog",
+        "description": "Playful Beagle with excellent hunting instincts. Friendly, curious, and great for active families.",
+        "price": 950.00,
+        "age_months": 6,
+        "available": True,
+        "image_url": "https://example.com/beagle.jpg",
+    },
+    {
+        "id": "pet004",
+        "name": "Siamese Cat",
+        "type": "cat",
+        "description": "Elegant Siamese cat with striking blue eyes. Vocal, intelligent, and social personality.",
+        "price": 650.00,
+        "age_months": 8,
+        "available": True,
+        "image_url": "https://example.com/siamese.jpg",
+    },
+    {
+        "id": "pet005",
+        "name": "Cockatiel",
+        "type": "bird",
+        "description": "Hand-tamed Cockatiel with yellow crest. Whistles and mimics sounds, very social bird.",
+        "price": 150.00,
+        "age_months": 4,
+        "available": True,
+        "image_url": "https://example.com/cockatiel.jpg",
+    },
+    {
+        "id": "pet006",
+        "name": "Betta Fish",
+        "type": "fish",
+        "description": "Beautiful Betta fish with vibrant blue and red coloring. Low maintenance and stunning to watch.",
+        "price": 25.00,
+        "age_months": 6,
+        "available": True,
+        "image_url": "https://example.com/betta.jpg",
+    },
+    {
+        "id": "pet007",
+        "name": "Holland Lop Rabbit",
+        "type": "rabbit",
+        "description": "Sweet Holland Lop rabbit with soft fur and floppy ears. Gentle and perfect for families.",
+        "price": 300.00,
+        "age_months": 5,
+        "available": True,
+        "image_url": "https://example.com/holland-lop.jpg",
+    },
+    {
+        "id": "pet008",
+        "name": "Syrian Hamster",
+        "type": "hamster",
+        "description": "Friendly Syrian hamster with golden brown fur. Active and entertaining, great starter pet.",
+        "price": 45.00,
+        "age_months": 2,
+        "available": True,
+        "image_url": "https://example.com/hamster.jpg",
+    },
+    {
+        "id": "pet009",
+        "name": "German Shepherd Puppy",
+        "type": "dog",
+        "description": "Intelligent German Shepherd puppy with excellent temperament. Loyal, trainable, and protective.",
+        "price": 1500.00,
+        "age_months": 4,
+        "available": True,
+        "image_url": "https://example.com/german-shepherd.jpg",
+    },
+    {
+        "id": "pet010",
+        "name": "Parakeet Pair",
+        "type": "bird",
+        "description": "Bonded pair of colorful parakeets (blue and green). Social, playful, and chatter together.",
+        "price": 80.00,
+        "age_months": 7,
+        "available": True,
+        "image_url": "https://example.com/parakeets.jpg",
+    },
+)
+
+
 async def initialize_sample_data():
-    """Initialize the database with sample pet data if empty"""
+    """Seed the database with sample pet data, inserting only pets that do not exist yet"""
     pets_collection = db.db.pets
 
-    # Check if pets collection is empty
-    count = await pets_collection.count_documents({})
-    if count == 0:
-        sample_pets = [
-            {
-                "id": "pet001",
-                "name": "Golden Retriever Puppy",
-                "type": "dog",
-                "description": "Friendly and energetic Golden Retriever puppy, great with families and children. Well-socialized and vaccinated.",
-                "price": 1200.00,
-                "age_months": 3,
-                "available": True,
-                "image_url": "https://example.com/golden-retriever.jpg",
-            },
-            {
-                "id": "pet002",
-                "name": "British Shorthair Kitten",
-                "type": "cat",
-                "description": "Adorable British Shorthair kitten with beautiful blue-gray coat. Calm and affectionate temperament.",
-                "price": 800.00,
-                "age_months": 2,
-                "available": True,
-                "image_url": "https://example.com/british-shorthair.jpg",
-            },
-            {
-                "id": "pet003",
-                "name": "Beagle",
-                "type": "dog",
-                "description": "Playful Beagle with excellent hunting instincts. Friendly, curious, and great for active families.",
-                "price": 950.00,
-                "age_months": 6,
-                "available": True,
-                "image_url": "https://example.com/beagle.jpg",
-            },
-            {
-                "id": "pet004",
-                "name": "Siamese Cat",
-                "type": "cat",
-                "description": "Elegant Siamese cat with striking blue eyes. Vocal, intelligent, and social personality.",
-                "price": 650.00,
-                "age_months": 8,
-                "available": True,
-                "image_url": "https://example.com/siamese.jpg",
-            },
-            {
-                "id": "pet005",
-                "name": "Cockatiel",
-                "type": "bird",
-                "description": "Hand-tamed Cockatiel with yellow crest. Whistles and mimics sounds, very social bird.",
-                "price": 150.00,
-                "age_months": 4,
-                "available": True,
-                "image_url": "https://example.com/cockatiel.jpg",
-            },
-            {
-                "id": "pet006",
-                "name": "Betta Fish",
-                "type": "fish",
-                "description": "Beautiful Betta fish with vibrant blue and red coloring. Low maintenance and stunning to watch.",
-                "price": 25.00,
-                "age_months": 6,
-                "available": True,
-                "image_url": "https://example.com/betta.jpg",
-            },
-            {
-                "id": "pet007",
-                "name": "Holland Lop Rabbit",
-                "type": "rabbit",
-                "description": "Sweet Holland Lop rabbit with soft fur and floppy ears. Gentle and perfect for families.",
-                "price": 300.00,
-                "age_months": 5,
-                "available": True,
-                "image_url": "https://example.com/holland-lop.jpg",
-            },
-            {
-                "id": "pet008",
-                "name": "Syrian Hamster",
-                "type": "hamster",
-                "description": "Friendly Syrian hamster with golden brown fur. Active and entertaining, great starter pet.",
-                "price": 45.00,
-                "age_months": 2,
-                "available": True,
-                "image_url": "https://example.com/hamster.jpg",
-            },
-            {
-                "id": "pet009",
-                "name": "German Shepherd Puppy",
-                "type": "dog",
-                "description": "Intelligent German Shepherd puppy with excellent temperament. Loyal, trainable, and protective.",
-                "price": 1500.00,
-                "age_months": 4,
-                "available": True,
-                "image_url": "https://example.com/german-shepherd.jpg",
-            },
-            {
-                "id": "pet010",
-                "name": "Parakeet Pair",
-                "type": "bird",
-                "description": "Bonded pair of colorful parakeets (blue and green). Social, playful, and chatter together.",
-                "price": 80.00,
-                "age_months": 7,
-                "available": True,
-                "image_url": "https://example.com/parakeets.jpg",
-            },
-        ]
-
-        await pets_collection.insert_many(sample_pets)
-        print(f"✓ Initialized database with {len(sample_pets)} sample pets")
+    # Single idempotent round trip: $setOnInsert leaves existing pets (and their availability) untouched
+    result = await pets_collection.bulk_write(
+        [UpdateOne({"id": pet["id"]}, {"$setOnInsert": pet}, upsert=True) for pet in _SAMPLE_PETS], ordered=False
+    )
+    if result.upserted_count:
+        print(f"✓ Initialized database with {result.upserted_count} sample pets")
@@ -3,19 +3,25 @@ Example usage and demo of the Pet Shop system.
 This script demonstrates the structured output and tool calling capabilities.
 """
 
-import json
+import sys
+
+import orjson
 
 from models import Pet, PetType, PlaceOrderInput
+from tools import TOOLS_DEFINITIONS
+
+
+def _write_lines(lines):
+    """Write a block of demo output with a single stdout write"""
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def demo_structured_models():
     """Demonstrate Pydantic structured models"""
-    print("\n" + "=" * 60)
-    print("DEMO: Structured Output Models with Pydantic")
-    print("=" * 60 + "\n")
+    lines = ["\n" + "=" * 60, "DEMO: Structured Output Models with Pydantic", "=" * 60 + "\n"]
 
     # Create a pet using structured model
-    print("1. Creating a Pet with structured model:")
+    lines.append("1. Creating a Pet with structured model:")
     pet = Pet(
         id="demo001",
         name="Golden Retriever Puppy",
@@ -25,12 +31,12 @@ def demo_structured_models():
         age_months=3,
         available=True,
     )
-    print(f"   Pet created: {pet.name} (${pet.price})")
-    print(f"   Type-safe enum: {pet.type} (type: {type(pet.type).__name__})")
-    print(f"   JSON output:\n   {pet.model_dump_json(indent=2)}\n")
+    lines.append(f"   Pet created: {pet.name} (${pet.price})")
+    lines.append(f"   Type-safe enum: {pet.type} (type: {type(pet.type).__name__})")
+    lines.append(f"   JSON output:\n   {pet.model_dump_json(indent=2)}\n")
 
     # Create order input (for tool calling)
-    print("2. Creating structured input for tool calling:")
+    lines.append("2. Creating structured input for tool calling:")
     order_input = PlaceOrderInput(
         customer_name="John Doe",
         customer_email="john@example.com",
@@ -38,11 +44,11 @@ def demo_structured_models():
         delivery_address="123 Main St, City, ST 12345",
         pet_ids=["demo001"],
     )
-    print(f"   Order input validated and ready")
-    print(f"   JSON for API:\n   {order_input.model_dump_json(indent=2)}\n")
+    lines.append(f"   Order input validated and ready")
+    lines.append(f"   JSON for API:\n   {order_input.model_dump_json(indent=2)}\n")
 
     # Show validation in action
-    print("3. Demonstrating validation:")
+    lines.append("3. Demonstrating validation:")
     try:
         Pet(
             id="demo002",
@@ -54,40 +60,38 @@ def demo_structured_models():
             available=True,
         )
     except Exception as e:
-        print(f"   ✓ Validation caught error: {type(e).__name__}")
-        print(f"   ✓ Invalid data rejected (negative price)\n")
+        lines.append(f"   ✓ Validation caught error: {type(e).__name__}")
+        lines.append(f"   ✓ Invalid data rejected (negative price)\n")
+
+    _write_lines(lines)
 
 
 def demo_tool_definitions():
     """Demonstrate tool calling definitions for Azure OpenAI"""
-    print("\n" + "=" * 60)
-    print("DEMO: Tool Calling Definitions for Azure OpenAI")
-    print("=" * 60 + "\n")
-
-    from tools import TOOLS_DEFINITIONS
+    lines = ["\n" + "=" * 60, "DEMO: Tool Calling Definitions for Azure OpenAI", "=" * 60 + "\n"]
 
-    print("Available tools for AI agent:\n")
+    lines.append("Available tools for AI agent:\n")
     for i, tool in enumerate(TOOLS_DEFINITIONS, 1):
         func = tool["function"]
-        print(f"{i}. {func['name']}")
-        print(f"   Description: {func['description']}")
-        print(f"   Parameters: {list(func['parameters']['properties'].keys())}")
-        print()
+        lines.append(f"{i}. {func['name']}")
+        lines.append(f"   Description: {func['description']}")
+        lines.append(f"   Parameters: {list(func['parameters']['properties'].keys())}")
+        lines.append("")
+
+    lines.append("These tools enable the AI to:")
+    lines.append("  • Browse pets with filters")
+    lines.append("  • Place orders with validation")
+    lines.append("  • Check order status")
+    lines.append("  • All with structured, type-safe inputs and outputs\n")
 
-    print("These tools enable the AI to:")
-    print("  • Browse pets with filters")
-    print("  • Place orders with validation")
-    print("  • Check order status")
-    print("  • All with structured, type-safe inputs and outputs\n")
+    _write_lines(lines)
 
 
 def demo_conversation_flow():
     """Demonstrate a typical conversation flow"""
-    print("\n" + "=" * 60)
-    print("DEMO: Typical Conversation Flow")
-    print("=" * 60 + "\n")
+    lines = ["\n" + "=" * 60, "DEMO: Typical Conversation Flow", "=" * 60 + "\n"]
 
-    print("Example conversation with the AI assistant:\n")
+    lines.append("Example conversation with the AI assistant:\n")
 
     conversation = [
         {"role": "user", "message": "Show me available dogs under $1000"},
@@ -123,22 +127,22 @@ def demo_conversation_flow():
 
     for step in conversation:
         if step["role"] == "user":
-            print(f"👤 User: {step['message']}")
+            lines.append(f"👤 User: {step['message']}")
         else:
-            print(f"🤖 Assistant:")
+            lines.append(f"🤖 Assistant:")
             if "action" in step:
-                print(f"   Action: {step['action']}")
+                lines.append(f"   Action: {step['action']}")
             if "params" in step:
-                print(f"   Params: {json.dumps(step['params'], indent=2)}")
-            print(f"   → {step['response']}")
-        print()
+                lines.append(f"   Params: {orjson.dumps(step['params'], option=orjson.OPT_INDENT_2).decode()}")
+            lines.append(f"   → {step['response']}")
+        lines.append("")
+
+    _write_lines(lines)
 
 
 def demo_structured_outputs_benefits():
     """Show benefits of structured outputs"""
-    print("\n" + "=" * 60)
-    print("DEMO: Benefits of Structured Outputs")
-    print("=" * 60 + "\n")
+    lines = ["\n" + "=" * 60, "DEMO: Benefits of Structured Outputs", "=" * 60 + "\n"]
 
     benefits = [
         {
@@ -157,53 +161,53 @@ def demo_structured_outputs_benefits():
     ]
 
     for i, item in enumerate(benefits, 1):
-        print(f"{i}. {item['benefit']}")
-        print(f"   → {item['example']}\n")
+        lines.append(f"{i}. {item['benefit']}")
+        lines.append(f"   → {item['example']}\n")
+
+    _write_lines(lines)
 
 
 def demo_azure_openai_integration():
     """Show how Azure OpenAI integrates with the system"""
-    print("\n" + "=" * 60)
-    print("DEMO: Azure OpenAI Integration Flow")
-    print("=" * 60 + "\n")
-
-    print("Integration Architecture:\n")
-
-    print("1️⃣  User sends message via Chainlit chat")
-    print("   ↓")
-    print("2️⃣  Message sent to Azure OpenAI with tool definitions")
-    print("   ↓")
-    print("3️⃣  Azure OpenAI decides which tool to call (if any)")
-    print("   ↓")
-    print("4️⃣  Tool parameters validated with Pydantic models")
-    print("   ↓")
-    print("5️⃣  Tool makes REST API call to FastAPI backend")
-    print("   ↓")
-    print("6️⃣  FastAPI validates request with Pydantic models")
-    print("   ↓")
-    print("7️⃣  MongoDB operation executed")
-    print("   ↓")
-    print("8️⃣  Response validated with Pydantic models")
-    print("   ↓")
-    print("9️⃣  Tool returns structured result to Azure OpenAI")
-    print("   ↓")
-    print("🔟 Azure OpenAI generates natural language response")
-    print("   ↓")
-    print("1️⃣1️⃣  User sees friendly message in Chainlit\n")
-
-    print("Key Features:")
-    print("  ✓ End-to-end type safety")
-    print("  ✓ Automatic validation at every step")
-    print("  ✓ Structured outputs from AI")
-    print("  ✓ Clean separation of concerns")
-    print("  ✓ Testable components\n")
+    lines = [
+        "\n" + "=" * 60,
+        "DEMO: Azure OpenAI Integration Flow",
+        "=" * 60 + "\n",
+        "Integration Architecture:\n",
+        "1️⃣  User sends message via Chainlit chat",
+        "   ↓",
+        "2️⃣  Message sent to Azure OpenAI with tool definitions",
+        "   ↓",
+        "3️⃣  Azure OpenAI decides which tool to call (if any)",
+        "   ↓",
+        "4️⃣  Tool parameters validated with Pydantic models",
+        "   ↓",
+        "5️⃣  Tool makes REST API call to FastAPI backend",
+        "   ↓",
+        "6️⃣  FastAPI validates request with Pydantic models",
+        "   ↓",
+        "7️⃣  MongoDB operation executed",
+        "   ↓",
+        "8️⃣  Response validated with Pydantic models",
+        "   ↓",
+        "9️⃣  Tool returns structured result to Azure OpenAI",
+        "   ↓",
+        "🔟 Azure OpenAI generates natural language response",
+        "   ↓",
+        "1️⃣1️⃣  User sees friendly message in Chainlit\n",
+        "Key Features:",
+        "  ✓ End-to-end type safety",
+        "  ✓ Automatic validation at every step",
+        "  ✓ Structured outputs from AI",
+        "  ✓ Clean separation of concerns",
+        "  ✓ Testable components\n",
+    ]
+    _write_lines(lines)
 
 
 def main():
     """Run all demos"""
-    print("\n" + "=" * 60)
-    print("🐾 PET PARADISE SHOP - SYSTEM DEMONSTRATION 🐾")
-    print("=" * 60)
+    _write_lines(["\n" + "=" * 60, "🐾 PET PARADISE SHOP - SYSTEM DEMONSTRATION 🐾", "=" * 60])
 
     demo_structured_models()
     demo_tool_definitions()
@@ -211,19 +215,20 @@ def main():
     demo_structured_outputs_benefits()
     demo_azure_openai_integration()
 
-    print("\n" + "=" * 60)
-    print("Demo Complete!")
-    print("=" * 60 + "\n")
-
-    print("To run the actual system:")
-    print("  1. Configure .env with your Azure OpenAI credentials")
-    print("  2. Start MongoDB")
-    print("  3. Run: python api.py (in one terminal)")
-    print("  4. Run: chainlit run app.py (in another terminal)")
-    print("  5. Open http://localhost:8001 and start chatting!\n")
-
-    print("Or use the startup script:")
-    print("  ./start.sh\n")
+    lines = [
+        "\n" + "=" * 60,
+        "Demo Complete!",
+        "=" * 60 + "\n",
+        "To run the actual system:",
+        "  1. Configure .env with your Azure OpenAI credentials",
+        "  2. Start MongoDB",
+        "  3. Run: python api.py (in one terminal)",
+        "  4. Run: chainlit run app.py (in another terminal)",
+        "  5. Open http://localhost:8001 and start chatting!\n",
+        "Or use the startup script:",
+        "  ./start.sh\n",
+    ]
+    _write_lines(lines)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,16 @@
+"""
+Environment configuration loading.
+Parses the .env file once per process, however many modules need it.
+"""
+
+from dotenv import load_dotenv
+
+_loaded = False
+
+
+def ensure_loaded():
+    """Load variables from .env into the environment on first call"""
+    global _loaded
+    if not _loaded:
+        load_dotenv()
+        _loaded = True
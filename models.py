@@ -5,9 +5,10 @@ These models ensure type safety and validation for the pet shop system.
 
 from datetime import datetime, timezone
 from enum import Enum
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, TypeAdapter, field_validator
+from pydantic.dataclasses import dataclass
 
 
 # Enums for type safety
@@ -33,15 +34,21 @@ class OrderStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+# Literal field types validate and serialize as plain strings, skipping enum coercion.
+# The enums above stay available as named constants for callers.
+PetTypeLiteral = Literal["dog", "cat", "bird", "fish", "rabbit", "hamster"]
+OrderStatusLiteral = Literal["pending", "confirmed", "processing", "shipped", "delivered", "cancelled"]
+
+
 # Pet Models
 class Pet(BaseModel):
     """Pet model for inventory"""
 
-    model_config = ConfigDict(use_enum_values=True)
+    model_config = ConfigDict(frozen=True)
 
     id: str = Field(description="Unique identifier for the pet")
     name: str = Field(description="Name/breed of the pet")
-    type: PetType = Field(description="Type of pet")
+    type: PetTypeLiteral = Field(description="Type of pet")
     description: str = Field(description="Detailed description of the pet")
     price: float = Field(gt=0, description="Price in USD")
     age_months: int = Field(ge=0, description="Age in months")
@@ -52,13 +59,17 @@ class Pet(BaseModel):
 class PetInventoryResponse(BaseModel):
     """Response model for pet inventory listing"""
 
+    model_config = ConfigDict(frozen=True)
+
     pets: List[Pet] = Field(description="List of available pets")
     total: int = Field(description="Total number of pets")
-    filtered_by_type: Optional[PetType] = Field(None, description="Filter applied")
+    filtered_by_type: Optional[PetTypeLiteral] = Field(None, description="Filter applied")
 
 
 # Order Models
-class OrderItem(BaseModel):
+# Plain value object created per ordered pet: a slotted dataclass avoids a per-instance __dict__
+@dataclass(config=ConfigDict(extra="forbid"), slots=True, frozen=True)
+class OrderItem:
     """Individual item in an order"""
 
     pet_id: str = Field(description="ID of the pet being ordered")
@@ -66,9 +77,15 @@ class OrderItem(BaseModel):
     price: float = Field(description="Price at time of order")
 
 
+# Validates a whole list of order items in one call into the Rust core instead of one call per item
+ORDER_ITEMS_ADAPTER = TypeAdapter(List[OrderItem])
+
+
 class CustomerInfo(BaseModel):
     """Customer information for order"""
 
+    model_config = ConfigDict(frozen=True)
+
     name: str = Field(min_length=1, description="Customer full name")
     email: EmailStr = Field(description="Customer email address")
     phone: str = Field(description="Customer phone number")
@@ -78,13 +95,13 @@ class CustomerInfo(BaseModel):
 class Order(BaseModel):
     """Order model"""
 
-    model_config = ConfigDict(use_enum_values=True)
+    model_config = ConfigDict(frozen=True)
 
     id: str = Field(description="Unique order identifier")
     customer: CustomerInfo = Field(description="Customer information")
     items: List[OrderItem] = Field(min_length=1, description="List of ordered items")
     total_amount: float = Field(gt=0, description="Total order amount")
-    status: OrderStatus = Field(default=OrderStatus.PENDING, description="Order status")
+    status: OrderStatusLiteral = Field(default="pending", description="Order status")
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc), description="Order creation timestamp"
     )
@@ -94,10 +111,13 @@ class Order(BaseModel):
 
 
 # Tool Calling Models (Structured Outputs for Azure OpenAI)
+# Input models reject unknown fields; models read back from MongoDB keep ignoring extras like _id.
 class BrowsePetsInput(BaseModel):
     """Input parameters for browsing pets"""
 
-    pet_type: Optional[PetType] = Field(None, description="Filter by pet type")
+    model_config = ConfigDict(frozen=True, extra="forbid", str_strip_whitespace=True)
+
+    pet_type: Optional[PetTypeLiteral] = Field(None, description="Filter by pet type")
     max_price: Optional[float] = Field(None, gt=0, description="Maximum price filter")
     min_age_months: Optional[int] = Field(None, ge=0, description="Minimum age in months")
     max_age_months: Optional[int] = Field(None, ge=0, description="Maximum age in months")
@@ -106,36 +126,67 @@ class BrowsePetsInput(BaseModel):
 class PlaceOrderInput(BaseModel):
     """Input parameters for placing an order"""
 
+    model_config = ConfigDict(frozen=True, extra="forbid", str_strip_whitespace=True)
+
     customer_name: str = Field(min_length=1, description="Customer full name")
     customer_email: EmailStr = Field(description="Customer email address")
     customer_phone: str = Field(description="Customer phone number")
     delivery_address: str = Field(min_length=5, description="Delivery address")
     pet_ids: List[str] = Field(min_length=1, description="List of pet IDs to order")
 
+    @field_validator("pet_ids")
+    @classmethod
+    def pet_ids_unique(cls, v: List[str]) -> List[str]:
+        """Reject orders that list the same pet more than once"""
+        if len(set(v)) != len(v):
+            raise ValueError("pet_ids must not contain duplicates")
+        return v
+
 
 class CheckOrderStatusInput(BaseModel):
     """Input parameters for checking order status"""
 
+    model_config = ConfigDict(frozen=True, extra="forbid", str_strip_whitespace=True)
+
     order_id: str = Field(description="Order ID to check")
 
 
 class OrderStatusResponse(BaseModel):
     """Response for order status check"""
 
-    model_config = ConfigDict(use_enum_values=True)
+    model_config = ConfigDict(frozen=True)
 
     order_id: str = Field(description="Order identifier")
-    status: OrderStatus = Field(description="Current order status")
+    status: OrderStatusLiteral = Field(description="Current order status")
     customer_name: str = Field(description="Customer name")
     total_amount: float = Field(description="Total order amount")
     created_at: datetime = Field(description="Order creation time")
     items_count: int = Field(description="Number of items in order")
 
 
+class HealthResponse(BaseModel):
+    """Response for the health check endpoint"""
+
+    model_config = ConfigDict(frozen=True)
+
+    status: str = Field(description="Overall service health")
+    database: str = Field(description="Database connection state")
+
+
+class MessageResponse(BaseModel):
+    """Simple acknowledgement response"""
+
+    model_config = ConfigDict(frozen=True)
+
+    message: str = Field(description="Human-readable result message")
+
+
 # Tool Response Models
 class ToolResponse(BaseModel):
     """Generic tool response wrapper"""
 
+    model_config = ConfigDict(frozen=True)
+
     success: bool = Field(description="Whether the operation was successful")
     message: str = Field(description="Human-readable message about the result")
     data: Optional[dict] = Field(None, description="Additional response data")
@@ -144,6 +195,8 @@ class ToolResponse(BaseModel):
 class BrowsePetsOutput(BaseModel):
     """Output from browse pets tool"""
 
+    model_config = ConfigDict(frozen=True)
+
     pets: List[Pet] = Field(description="List of matching pets")
     message: str = Field(description="Summary message")
 
@@ -151,6 +204,8 @@ class BrowsePetsOutput(BaseModel):
 class PlaceOrderOutput(BaseModel):
     """Output from place order tool"""
 
+    model_config = ConfigDict(frozen=True)
+
     order_id: str = Field(description="Created order ID")
     total_amount: float = Field(description="Total order amount")
     message: str = Field(description="Confirmation message")
@@ -3,27 +3,24 @@ Observability configuration for Pet Paradise Shop.
 Includes OpenTelemetry tracing, Prometheus metrics, and Jaeger integration.
 """
 
+import functools
 import logging
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, Optional
 
-from dotenv import load_dotenv
 from opentelemetry import metrics, trace
-from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
-from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
-from opentelemetry.exporter.prometheus import PrometheusMetricReader
-from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
-from opentelemetry.instrumentation.logging import LoggingInstrumentor
-from opentelemetry.instrumentation.pymongo import PymongoInstrumentor
-from opentelemetry.sdk.metrics import MeterProvider
-from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
-from opentelemetry.sdk.resources import SERVICE_NAME, SERVICE_VERSION, Resource
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from prometheus_client import Counter, Gauge, Histogram, start_http_server
 
-load_dotenv()
+from env import ensure_loaded
+from models import OrderStatus, PetType
+
+# SDK, exporters and instrumentors are imported inside the setup functions so that
+# importing this module (e.g. via tools.py) does not pull in gRPC/protobuf
+if TYPE_CHECKING:
+    from opentelemetry.sdk.metrics import MeterProvider
+    from opentelemetry.sdk.trace import TracerProvider
+
+ensure_loaded()
 
 # Configuration
 SERVICE_NAME_VALUE = os.getenv("SERVICE_NAME", "pet-paradise-shop")
@@ -33,19 +30,11 @@ JAEGER_ENDPOINT = os.getenv("JAEGER_ENDPOINT", "http://localhost:14268/api/trace
 PROMETHEUS_PORT = int(os.getenv("PROMETHEUS_PORT", "9090"))
 ENABLE_TRACING = os.getenv("ENABLE_TRACING", "true").lower() == "true"
 ENABLE_METRICS = os.getenv("ENABLE_METRICS", "true").lower() == "true"
-
-# Resource describes the service
-resource = Resource.create(
-    {
-        SERVICE_NAME: SERVICE_NAME_VALUE,
-        SERVICE_VERSION: SERVICE_VERSION_VALUE,
-        "deployment.environment": os.getenv("ENVIRONMENT", "development"),
-    }
-)
+ENABLE_OBSERVABILITY = os.getenv("ENABLE_OBSERVABILITY", "true").lower() == "true"
 
 # Initialize tracer
-tracer_provider: Optional[TracerProvider] = None
-meter_provider: Optional[MeterProvider] = None
+tracer_provider: Optional["TracerProvider"] = None
+meter_provider: Optional["MeterProvider"] = None
 
 # Prometheus metrics
 request_count = Counter("petshop_requests_total", "Total number of requests", ["method", "endpoint", "status"])
@@ -61,6 +50,47 @@ order_count = Counter("petshop_orders_total", "Total number of orders", ["status
 tool_calls = Counter("petshop_tool_calls_total", "Total number of tool calls", ["tool_name", "success"])
 
 
+# Request label children cached per (method, endpoint, status) combination to skip .labels() lookups
+@functools.lru_cache(maxsize=1024)
+def _request_count_child(method: str, endpoint: str, status: int):
+    return request_count.labels(method=method, endpoint=endpoint, status=status)
+
+
+@functools.lru_cache(maxsize=1024)
+def _request_duration_child(method: str, endpoint: str):
+    return request_duration.labels(method=method, endpoint=endpoint)
+
+
+# Bounded label spaces are pre-registered at import, so recording is a single dict lookup
+TOOL_NAMES = ("browse_pets", "place_order", "check_order_status")
+
+_PET_INVENTORY_CHILDREN = {
+    pet_type: pet_inventory_count.labels(pet_type=pet_type) for pet_type in (*(t.value for t in PetType), "all")
+}
+_ORDER_COUNT_CHILDREN = {
+    order_status.value: order_count.labels(status=order_status.value) for order_status in OrderStatus
+}
+_TOOL_CALLS_CHILDREN = {
+    (tool_name, success): tool_calls.labels(tool_name=tool_name, success=str(success).lower())
+    for tool_name in TOOL_NAMES
+    for success in (True, False)
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _create_resource():
+    """Create the resource describing the service."""
+    from opentelemetry.sdk.resources import SERVICE_NAME, SERVICE_VERSION, Resource
+
+    return Resource.create(
+        {
+            SERVICE_NAME: SERVICE_NAME_VALUE,
+            SERVICE_VERSION: SERVICE_VERSION_VALUE,
+            "deployment.environment": os.getenv("ENVIRONMENT", "development"),
+        }
+    )
+
+
 def setup_tracing():
     """Configure OpenTelemetry tracing with OTLP and Jaeger exporters."""
     global tracer_provider
@@ -70,16 +100,34 @@ def setup_tracing():
         return
 
     try:
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import Compression, OTLPSpanExporter
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+        from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+        from opentelemetry.instrumentation.logging import LoggingInstrumentor
+        from opentelemetry.instrumentation.pymongo import PymongoInstrumentor
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
         # Create OTLP span exporter
         otlp_exporter = OTLPSpanExporter(
-            endpoint=OTLP_ENDPOINT, insecure=True  # Use secure=True in production with proper certificates
+            endpoint=OTLP_ENDPOINT,
+            insecure=True,  # Use secure=True in production with proper certificates
+            compression=Compression.Gzip,
         )
 
         # Create trace provider
-        tracer_provider = TracerProvider(resource=resource)
-
-        # Add span processor
-        tracer_provider.add_span_processor(BatchSpanProcessor(otlp_exporter))
+        tracer_provider = TracerProvider(resource=_create_resource())
+
+        # Add span processor (larger queue and batches so bursts don't drop spans)
+        tracer_provider.add_span_processor(
+            BatchSpanProcessor(
+                otlp_exporter,
+                max_queue_size=8192,
+                max_export_batch_size=1024,
+                schedule_delay_millis=2000,
+                export_timeout_millis=10_000,
+            )
+        )
 
         # Set as global tracer provider
         trace.set_tracer_provider(tracer_provider)
@@ -106,6 +154,11 @@ def setup_metrics():
         return
 
     try:
+        from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
+        from opentelemetry.exporter.prometheus import PrometheusMetricReader
+        from opentelemetry.sdk.metrics import MeterProvider
+        from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+
         # Create Prometheus metric reader
         prometheus_reader = PrometheusMetricReader()
 
@@ -114,11 +167,11 @@ def setup_metrics():
 
         # Create periodic exporting metric reader for OTLP
         otlp_reader = PeriodicExportingMetricReader(
-            otlp_metric_exporter, export_interval_millis=60000  # Export every 60 seconds
+            otlp_metric_exporter, export_interval_millis=15000, export_timeout_millis=10_000  # Export every 15 seconds
         )
 
         # Create meter provider with both readers
-        meter_provider = MeterProvider(resource=resource, metric_readers=[prometheus_reader, otlp_reader])
+        meter_provider = MeterProvider(resource=_create_resource(), metric_readers=[prometheus_reader, otlp_reader])
 
         # Set as global meter provider
         metrics.set_meter_provider(meter_provider)
@@ -134,77 +187,67 @@ def setup_metrics():
         logging.info("Application will continue without metrics")
 
 
+# Tracers and meters cached per instrumentation name (proxies resolve to the real providers once set)
+_TRACERS: Dict[str, trace.Tracer] = {}
+_METERS: Dict[str, metrics.Meter] = {}
+
+
 def get_tracer(name: str):
     """Get a tracer instance."""
-    return trace.get_tracer(name, SERVICE_VERSION_VALUE)
+    tracer = _TRACERS.get(name)
+    if tracer is None:
+        tracer = _TRACERS.setdefault(name, trace.get_tracer(name, SERVICE_VERSION_VALUE))
+    return tracer
 
 
 def get_meter(name: str):
     """Get a meter instance."""
-    return metrics.get_meter(name, SERVICE_VERSION_VALUE)
+    meter = _METERS.get(name)
+    if meter is None:
+        meter = _METERS.setdefault(name, metrics.get_meter(name, SERVICE_VERSION_VALUE))
+    return meter
 
 
 def record_request(method: str, endpoint: str, status: int, duration: float):
     """Record HTTP request metrics."""
-    try:
-        request_count.labels(method=method, endpoint=endpoint, status=status).inc()
-        request_duration.labels(method=method, endpoint=endpoint).observe(duration)
-    except Exception as e:
-        logging.debug(f"Failed to record request metrics: {e}")
+    _request_count_child(method, endpoint, status).inc()
+    _request_duration_child(method, endpoint).observe(duration)
 
 
 def record_pet_inventory(pet_type: str, count: int):
-    """Record pet inventory metrics."""
-    try:
-        pet_inventory_count.labels(pet_type=pet_type).set(count)
-    except Exception as e:
-        logging.debug(f"Failed to record inventory metrics: {e}")
+    """Record pet inventory metrics. Unknown pet types are ignored to keep label cardinality bounded."""
+    child = _PET_INVENTORY_CHILDREN.get(pet_type)
+    if child is not None:
+        child.set(count)
 
 
 def record_order(status: str):
     """Record order metrics."""
-    try:
-        order_count.labels(status=status).inc()
-    except Exception as e:
-        logging.debug(f"Failed to record order metrics: {e}")
+    _ORDER_COUNT_CHILDREN[status].inc()
 
 
 def record_tool_call(tool_name: str, success: bool):
     """Record tool call metrics."""
-    try:
-        tool_calls.labels(tool_name=tool_name, success=str(success).lower()).inc()
-    except Exception as e:
-        logging.debug(f"Failed to record tool call metrics: {e}")
+    _TOOL_CALLS_CHILDREN[tool_name, success].inc()
 
 
 def increment_active_requests():
     """Increment active requests counter."""
-    try:
-        active_requests.inc()
-    except Exception as e:
-        logging.debug(f"Failed to increment active requests: {e}")
+    active_requests.inc()
 
 
 def decrement_active_requests():
     """Decrement active requests counter."""
-    try:
-        active_requests.dec()
-    except Exception as e:
-        logging.debug(f"Failed to decrement active requests: {e}")
+    active_requests.dec()
 
 
 def init_observability():
-    """Initialize all observability components."""
+    """Initialize all observability components. Called explicitly by the application entry points."""
+    if not ENABLE_OBSERVABILITY:
+        logging.info("Observability is disabled")
+        return
+
     logging.info("Initializing observability stack...")
     setup_tracing()
     setup_metrics()
     logging.info("✓ Observability stack initialized")
-
-
-# Initialize on module import if running as main application
-if __name__ != "__main__":
-    try:
-        init_observability()
-    except Exception as e:
-        logging.warning(f"Observability initialization failed: {e}")
-        logging.info("Application will continue without full observability")
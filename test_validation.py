@@ -1,65 +1,44 @@
 """
 Simple validation tests for the pet shop system.
 Tests model validation, imports, and basic functionality.
+Run with: pytest test_validation.py
 """
 
+import pytest
 from pydantic import ValidationError
+from pymongo.errors import DuplicateKeyError
 
+import tools
 from models import (
     BrowsePetsInput,
     CheckOrderStatusInput,
     CustomerInfo,
     Order,
     OrderItem,
-    OrderStatus,
     Pet,
     PetType,
     PlaceOrderInput,
 )
 
 
-def test_pet_model():
+def test_pet_model(sample_pet):
     """Test Pet model validation"""
-    print("Testing Pet model...")
-
-    pet = Pet(
-        id="test001",
-        name="Test Dog",
-        type=PetType.DOG,
-        description="A test dog",
-        price=100.0,
-        age_months=6,
-        available=True,
-    )
-
-    assert pet.id == "test001"
-    assert pet.type == "dog"  # Enum should be converted to value
-    assert pet.price == 100.0
-    print("✓ Pet model validation passed")
+    assert sample_pet.id == "test001"
+    assert sample_pet.type == "dog"  # Enum should be converted to value
+    assert sample_pet.price == 100.0
 
 
-def test_order_model():
+def test_order_model(sample_order):
     """Test Order model validation"""
-    print("Testing Order model...")
-
-    customer = CustomerInfo(name="Test Customer", email="test@example.com", phone="555-0123", address="123 Test St")
-
-    item = OrderItem(pet_id="test001", pet_name="Test Dog", price=100.0)
-
-    order = Order(id="ORD-TEST", customer=customer, items=[item], total_amount=100.0, status=OrderStatus.PENDING)
-
-    assert order.id == "ORD-TEST"
-    assert order.customer.name == "Test Customer"
-    assert len(order.items) == 1
-    assert order.total_amount == 100.0
-    assert order.status == "pending"
-    print("✓ Order model validation passed")
+    assert sample_order.id == "ORD-TEST"
+    assert sample_order.customer.name == "Test Customer"
+    assert len(sample_order.items) == 1
+    assert sample_order.total_amount == 100.0
+    assert sample_order.status == "pending"
 
 
 def test_tool_input_models():
     """Test tool input models"""
-    print("Testing tool input models...")
-
     # Test BrowsePetsInput
     browse_input = BrowsePetsInput(pet_type=PetType.CAT, max_price=500.0)
     assert browse_input.pet_type == "cat"
@@ -79,102 +58,170 @@ def test_tool_input_models():
     check_status = CheckOrderStatusInput(order_id="ORD-TEST")
     assert check_status.order_id == "ORD-TEST"
 
-    print("✓ Tool input models validation passed")
-
 
 def test_imports():
-    """Test that all imports work"""
-    print("Testing imports...")
-
-    try:
-        # models symbols are imported at module level via 'from models import ...'
-        _pet = Pet(
-            id="import-test",
-            name="Import Test Pet",
-            type=PetType.DOG,
-            description="Import test",
-            price=1.0,
-            age_months=1,
-            available=True,
-        )
-        import tools
-
-        print("✓ models symbols imported successfully")
-        print("✓ tools.py imports successfully")
-
-        # Check tool definitions exist
-        assert len(tools.TOOLS_DEFINITIONS) == 3
-        assert len(tools.TOOLS_MAP) == 3
-        assert "browse_pets" in tools.TOOLS_MAP
-        assert "place_order" in tools.TOOLS_MAP
-        assert "check_order_status" in tools.TOOLS_MAP
-        print("✓ Tool definitions are complete")
-
-    except ImportError as e:
-        print(f"✗ Import error: {e}")
-        raise
-
-
-def test_pydantic_validation():
-    """Test Pydantic validation works"""
-    print("Testing Pydantic validation...")
-
-    try:
-        # Should fail - negative price
-        Pet(
-            id="test",
-            name="Test",
-            type=PetType.DOG,
-            description="Test",
-            price=-100.0,  # Invalid
-            age_months=6,
-            available=True,
-        )
-        print("✗ Validation should have failed for negative price")
-    except ValidationError:
-        print("✓ Pydantic validation working (negative price rejected)")
-
-    try:
-        # Should fail - empty name
-        PlaceOrderInput(
-            customer_name="",  # Invalid
-            customer_email="test@example.com",
-            customer_phone="555",
-            delivery_address="123 Test St",
-            pet_ids=["pet001"],
-        )
-        print("✗ Validation should have failed for empty name")
-    except ValidationError:
-        print("✓ Pydantic validation working (empty name rejected)")
-
-
-def main():
-    """Run all tests"""
-    print("\n" + "=" * 50)
-    print("Pet Shop System Validation Tests")
-    print("=" * 50 + "\n")
-
-    try:
-        test_imports()
-        print()
-        test_pet_model()
-        print()
-        test_order_model()
-        print()
-        test_tool_input_models()
-        print()
-        test_pydantic_validation()
-
-        print("\n" + "=" * 50)
-        print("✓ All validation tests passed!")
-        print("=" * 50 + "\n")
-
-    except Exception as e:
-        print("\n" + "=" * 50)
-        print(f"✗ Tests failed: {e}")
-        print("=" * 50 + "\n")
-        raise
-
-
-if __name__ == "__main__":
-    main()
+    """Test that tools.py defines every tool"""
+    tool_names = {"browse_pets", "place_order", "check_order_status"}
+    assert tools.TOOLS_MAP.keys() == tool_names
+    assert {tool["function"]["name"] for tool in tools.TOOLS_DEFINITIONS} == tool_names
+
+
+@pytest.mark.parametrize(
+    "model", [Pet, Order, CustomerInfo, OrderItem, BrowsePetsInput, PlaceOrderInput, CheckOrderStatusInput]
+)
+def test_model_schema_built_at_import(model):
+    """Validators are compiled when models.py is imported, not on first use"""
+    assert model.__pydantic_complete__
+
+
+VALID_PET = {
+    "id": "test",
+    "name": "Test",
+    "type": PetType.DOG,
+    "description": "Test",
+    "price": 100.0,
+    "age_months": 6,
+    "available": True,
+}
+VALID_ORDER_INPUT = {
+    "customer_name": "Test",
+    "customer_email": "test@example.com",
+    "customer_phone": "555",
+    "delivery_address": "123 Test St",
+    "pet_ids": ["pet001"],
+}
+
+
+@pytest.mark.parametrize(
+    "model,payload",
+    [
+        pytest.param(Pet, {**VALID_PET, "price": -100.0}, id="negative-price"),
+        pytest.param(PlaceOrderInput, {**VALID_ORDER_INPUT, "customer_name": ""}, id="empty-customer-name"),
+        pytest.param(PlaceOrderInput, {**VALID_ORDER_INPUT, "pet_ids": ["pet001", "pet001"]}, id="duplicate-pet-ids"),
+        pytest.param(CheckOrderStatusInput, {"order_id": "ORD-TEST", "unexpected": "value"}, id="unknown-field"),
+    ],
+)
+def test_pydantic_validation(model, payload):
+    """Test Pydantic validation rejects invalid input"""
+    with pytest.raises(ValidationError):
+        model(**payload)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_browse_pets_tool(tool_client):
+    """browse_pets returns only pets of the requested type"""
+    result = await tools.browse_pets_tool(pet_type="dog")
+    assert result["total"] > 0
+    assert {pet["type"] for pet in result["pets"]} == {"dog"}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_browse_pets_tool_rejects_unknown_type():
+    """Unknown pet types are rejected without calling the API"""
+    result = await tools.browse_pets_tool(pet_type="dragon")
+    assert result["total"] == 0
+    assert result["message"].startswith("Invalid search filters: pet_type")
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_place_order_tool_unavailable_pet(tool_client):
+    """Ordering a pet that does not exist surfaces the API's error detail"""
+    result = await tools.place_order_tool(
+        customer_name="Test",
+        customer_email="test@example.com",
+        customer_phone="555-0123",
+        delivery_address="123 Test St",
+        pet_ids=["pet999"],
+    )
+    assert result["success"] is False
+    assert "pet999" in result["message"]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_check_order_status_tool_not_found(tool_client):
+    """Unknown order IDs report a not-found message"""
+    result = await tools.check_order_status_tool(order_id="ORD-MISSING")
+    assert result["success"] is False
+    assert "not found" in result["message"]
+
+
+async def _available_pet_id():
+    """ID of a pet that can currently be ordered"""
+    import api
+
+    pet = await api.pets_collection.find_one({"available": True}, projection={"_id": 0, "id": 1})
+    if pet is None:
+        pytest.skip("No available pets left to order")
+    return pet["id"]
+
+
+async def _place_test_order(pet_id):
+    return await tools.place_order_tool(
+        customer_name="Test",
+        customer_email="test@example.com",
+        customer_phone="555-0123",
+        delivery_address="123 Test St",
+        pet_ids=[pet_id],
+    )
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_place_order_tool_reserves_pets(tool_client):
+    """A successful order is retrievable and marks its pets as reserved by it"""
+    import api
+
+    pet_id = await _available_pet_id()
+    result = await _place_test_order(pet_id)
+    assert result["success"] is True
+
+    pet = await api.pets_collection.find_one({"id": pet_id})
+    assert pet["available"] is False
+    assert pet["reserved_by"] == result["order_id"]
+
+    order_status = await tools.check_order_status_tool(order_id=result["order_id"])
+    assert order_status["success"] is True
+    assert order_status["status"] == "pending"
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_create_order_retries_duplicate_order_id(tool_client, monkeypatch):
+    """A collision with an existing order is retried with a fresh ID and leaves that order's pets sold"""
+    import api
+
+    existing = await _place_test_order(await _available_pet_id())
+    assert existing["success"] is True
+    existing_pet_id = existing["order"]["items"][0]["pet_id"]
+
+    # Draw the existing order's ID first, then a fresh one
+    fresh_token = api.secrets.token_hex(4)
+    tokens = iter([existing["order_id"].removeprefix("ORD-").lower(), fresh_token])
+    monkeypatch.setattr(api.secrets, "token_hex", lambda nbytes: next(tokens))
+    pet_id = await _available_pet_id()
+    result = await _place_test_order(pet_id)
+
+    assert result["success"] is True
+    assert result["order_id"] == f"ORD-{fresh_token.upper()}"
+    pet = await api.pets_collection.find_one({"id": pet_id})
+    assert pet["reserved_by"] == result["order_id"]
+    existing_pet = await api.pets_collection.find_one({"id": existing_pet_id})
+    assert existing_pet["available"] is False
+    assert existing_pet["reserved_by"] == existing["order_id"]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_create_order_releases_pets_when_insert_fails(tool_client, monkeypatch):
+    """Pets reserved alongside a failed order insert are made available again"""
+    import api
+
+    async def always_collide(document):
+        raise DuplicateKeyError("duplicate key error")
+
+    monkeypatch.setattr(api.orders_collection, "insert_one", always_collide)
+    pet_id = await _available_pet_id()
+    result = await _place_test_order(pet_id)
+
+    assert result["success"] is False
+    assert "unique order ID" in result["message"]
+    pet = await api.pets_collection.find_one({"id": pet_id})
+    assert pet["available"] is True
+    assert "reserved_by" not in pet
@@ -3,10 +3,20 @@ Tool calling functions for the chat agent.
 These functions connect the AI agent to the pet shop API.
 """
 
+import asyncio
+import functools
 import os
-from typing import List, Optional
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import quote
 
 import httpx
+import orjson
+from pydantic import ValidationError
+
+from env import ensure_loaded
+from models import BrowsePetsInput, PetType
 
 # Import observability
 try:
@@ -17,11 +27,89 @@ try:
 except ImportError:
     OBSERVABILITY_ENABLED = False
 
+ensure_loaded()
+
+ToolFunction = Callable[..., Awaitable[Dict[str, Any]]]
 
 # Get API base URL from environment or default to localhost
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
 
+# Pet types accepted by the browse_pets tool, used for its JSON-schema enum
+VALID_PET_TYPES = frozenset(pet_type.value for pet_type in PetType)
+
+# Request bodies are pre-encoded with orjson, so the content type is set explicitly
+_JSON_HEADERS = MappingProxyType({"Content-Type": "application/json"})
+
+# Shared HTTP client so tool calls reuse pooled keep-alive connections to the API
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Get the shared API client, creating it on first use"""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=API_BASE_URL,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            timeout=10.0,
+        )
+    return _client
+
+
+async def close_client():
+    """Close the shared API client"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _error_detail(error: httpx.HTTPStatusError) -> str:
+    """Extract the API's error detail, falling back to the exception text for non-JSON bodies"""
+    if error.response.headers.get("content-type", "").startswith("application/json"):
+        try:
+            return orjson.loads(error.response.content).get("detail", str(error))
+        except ValueError:
+            pass
+    return str(error)
+
+
+def _instrument(
+    tool_name: str, succeeded: Callable[[dict], bool], span_attributes: Optional[Callable[..., dict]] = None
+) -> Callable[[ToolFunction], ToolFunction]:
+    """
+    Wrap a tool in a tracing span and record a tool-call metric.
+
+    The choice is made once at import: without observability the tool is returned unwrapped,
+    so the call path carries no per-call OBSERVABILITY_ENABLED check.
+    """
+
+    def decorator(tool: ToolFunction) -> ToolFunction:
+        if not OBSERVABILITY_ENABLED:
+            return tool
+
+        @functools.wraps(tool)
+        async def instrumented(*args, **kwargs) -> dict:
+            with tracer.start_as_current_span(f"{tool_name}_tool") as span:
+                if span_attributes is not None:
+                    for key, value in span_attributes(*args, **kwargs).items():
+                        span.set_attribute(key, value)
+                result = await tool(*args, **kwargs)
+                # The metric update is deferred to the next loop tick so the result returns first
+                asyncio.get_running_loop().call_soon(record_tool_call, tool_name, succeeded(result))
+                return result
+
+        return instrumented
+
+    return decorator
+
 
+def _browse_span_attributes(pet_type: Optional[str] = None, max_price: Optional[float] = None, *_, **__) -> dict:
+    """Span attributes for browse_pets, accepting the tool's own arguments"""
+    return {"pet_type": pet_type or "all", "max_price": max_price or 0}
+
+
+@_instrument("browse_pets", lambda result: result.get("total", 0) > 0, _browse_span_attributes)
 async def browse_pets_tool(
     pet_type: Optional[str] = None,
     max_price: Optional[float] = None,
@@ -40,50 +128,44 @@ async def browse_pets_tool(
     Returns:
         Dictionary with list of available pets and summary message
     """
-    # Start tracing span
-    if OBSERVABILITY_ENABLED:
-        with tracer.start_as_current_span("browse_pets_tool") as span:
-            span.set_attribute("pet_type", pet_type or "all")
-            span.set_attribute("max_price", max_price or 0)
-            result = await _browse_pets_impl(pet_type, max_price, min_age_months, max_age_months)
-            record_tool_call("browse_pets", result.get("total", 0) > 0)
-            return result
-    else:
-        return await _browse_pets_impl(pet_type, max_price, min_age_months, max_age_months)
-
-
-async def _browse_pets_impl(pet_type, max_price, min_age_months, max_age_months) -> dict:
-    async with httpx.AsyncClient() as client:
-        params = {"available_only": True}
-        if pet_type:
-            params["pet_type"] = pet_type.lower()
-        if max_price is not None:
-            params["max_price"] = max_price
-        if min_age_months is not None:
-            params["min_age_months"] = min_age_months
-        if max_age_months is not None:
-            params["max_age_months"] = max_age_months
+    # Validate through the shared input model (pydantic-core) rather than hand-written checks
+    try:
+        filters = BrowsePetsInput.model_validate(
+            {
+                "pet_type": pet_type.lower() if pet_type else None,
+                "max_price": max_price,
+                "min_age_months": min_age_months,
+                "max_age_months": max_age_months,
+            }
+        )
+    except ValidationError as e:
+        details = "; ".join(f"{error['loc'][0]}: {error['msg']}" for error in e.errors())
+        return {"pets": [], "message": f"Invalid search filters: {details}", "total": 0}
 
-        try:
-            response = await client.get(f"{API_BASE_URL}/pets", params=params)
-            response.raise_for_status()
-            data = response.json()
+    client = get_client()
+    params = {"available_only": True, **filters.model_dump(exclude_none=True)}
 
-            pets = data.get("pets", [])
-            total = data.get("total", 0)
+    try:
+        response = await client.get("/pets", params=params)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
 
-            if total == 0:
-                message = "No pets found matching your criteria. Try adjusting your filters."
-            else:
-                message = f"Found {total} pet(s) matching your criteria."
-                if pet_type:
-                    message += f" (Type: {pet_type})"
+        pets = data.get("pets", [])
+        total = data.get("total", 0)
 
-            return {"pets": pets, "message": message, "total": total}
-        except httpx.HTTPError as e:
-            return {"pets": [], "message": f"Error browsing pets: {str(e)}", "total": 0}
+        if total == 0:
+            message = "No pets found matching your criteria. Try adjusting your filters."
+        else:
+            message = f"Found {total} pet(s) matching your criteria."
+            if pet_type:
+                message += f" (Type: {pet_type})"
 
+        return {"pets": pets, "message": message, "total": total}
+    except httpx.HTTPError as e:
+        return {"pets": [], "message": f"Error browsing pets: {str(e)}", "total": 0}
 
+
+@_instrument("place_order", lambda result: result["success"])
 async def place_order_tool(
     customer_name: str, customer_email: str, customer_phone: str, delivery_address: str, pet_ids: List[str]
 ) -> dict:
@@ -100,53 +182,65 @@ async def place_order_tool(
     Returns:
         Dictionary with order confirmation details
     """
-    async with httpx.AsyncClient() as client:
-        order_data = {
-            "customer_name": customer_name,
-            "customer_email": customer_email,
-            "customer_phone": customer_phone,
-            "delivery_address": delivery_address,
-            "pet_ids": pet_ids,
+    client = get_client()
+    order_data = {
+        "customer_name": customer_name,
+        "customer_email": customer_email,
+        "customer_phone": customer_phone,
+        "delivery_address": delivery_address,
+        "pet_ids": pet_ids,
+    }
+
+    try:
+        response = await client.post("/orders", content=orjson.dumps(order_data), headers=_JSON_HEADERS)
+        response.raise_for_status()
+        order = orjson.loads(response.content)
+
+        order_id = order.get("id")
+        total_amount = order.get("total_amount")
+        items_count = len(order.get("items", []))
+
+        message = (
+            f"✓ Order confirmed! Order ID: {order_id}\n"
+            f"Total: ${total_amount:.2f} for {items_count} pet(s)\n"
+            f"Delivery to: {delivery_address}\n"
+            f"You will receive a confirmation email at {customer_email}"
+        )
+
+        return {
+            "success": True,
+            "order_id": order_id,
+            "total_amount": total_amount,
+            "message": message,
+            "order": order,
         }
+    except httpx.HTTPStatusError as e:
+        error_detail = _error_detail(e)
+        return {
+            "success": False,
+            "order_id": None,
+            "total_amount": 0,
+            "message": f"Failed to place order: {error_detail}",
+        }
+    except httpx.HTTPError as e:
+        return {"success": False, "order_id": None, "total_amount": 0, "message": f"Error placing order: {str(e)}"}
 
-        try:
-            response = await client.post(f"{API_BASE_URL}/orders", json=order_data)
-            response.raise_for_status()
-            order = response.json()
-
-            order_id = order.get("id")
-            total_amount = order.get("total_amount")
-            items_count = len(order.get("items", []))
 
-            message = (
-                f"✓ Order confirmed! Order ID: {order_id}\n"
-                f"Total: ${total_amount:.2f} for {items_count} pet(s)\n"
-                f"Delivery to: {delivery_address}\n"
-                f"You will receive a confirmation email at {customer_email}"
-            )
+# Fields of the API's OrderStatusResponse, all required by its response model
+_STATUS_FIELDS = itemgetter("order_id", "status", "customer_name", "total_amount", "items_count", "created_at")
 
-            return {
-                "success": True,
-                "order_id": order_id,
-                "total_amount": total_amount,
-                "message": message,
-                "order": order,
-            }
-        except httpx.HTTPStatusError as e:
-            try:
-                error_detail = e.response.json().get("detail", str(e))
-            except (ValueError, KeyError):
-                error_detail = str(e)
-            return {
-                "success": False,
-                "order_id": None,
-                "total_amount": 0,
-                "message": f"Failed to place order: {error_detail}",
-            }
-        except httpx.HTTPError as e:
-            return {"success": False, "order_id": None, "total_amount": 0, "message": f"Error placing order: {str(e)}"}
+# Customer-facing description for each order status
+_STATUS_MESSAGES: Dict[str, str] = {
+    "pending": "📋 Your order is pending confirmation",
+    "confirmed": "✓ Your order has been confirmed and is being prepared",
+    "processing": "📦 Your order is being processed",
+    "shipped": "🚚 Your order has been shipped and is on the way",
+    "delivered": "✓ Your order has been delivered",
+    "cancelled": "✗ Your order has been cancelled",
+}
 
 
+@_instrument("check_order_status", lambda result: result["success"])
 async def check_order_status_tool(order_id: str) -> dict:
     """
     Check the status of an existing order.
@@ -157,75 +251,58 @@ async def check_order_status_tool(order_id: str) -> dict:
     Returns:
         Dictionary with order status information
     """
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{API_BASE_URL}/orders/{order_id}/status")
-            response.raise_for_status()
-            status_data = response.json()
-
-            order_id = status_data.get("order_id")
-            status = status_data.get("status")
-            customer_name = status_data.get("customer_name")
-            total_amount = status_data.get("total_amount")
-            items_count = status_data.get("items_count")
-            created_at = status_data.get("created_at")
-
-            status_messages = {
-                "pending": "📋 Your order is pending confirmation",
-                "confirmed": "✓ Your order has been confirmed and is being prepared",
-                "processing": "📦 Your order is being processed",
-                "shipped": "🚚 Your order has been shipped and is on the way",
-                "delivered": "✓ Your order has been delivered",
-                "cancelled": "✗ Your order has been cancelled",
-            }
-
-            status_msg = status_messages.get(status, f"Status: {status}")
-
-            message = (
-                f"Order Status for {order_id}:\n"
-                f"{status_msg}\n"
-                f"Customer: {customer_name}\n"
-                f"Items: {items_count} pet(s)\n"
-                f"Total: ${total_amount:.2f}"
-            )
-
-            return {
-                "success": True,
-                "order_id": order_id,
-                "status": status,
-                "message": message,
-                "details": status_data,
-                "created_at": created_at,
-            }
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 404:
-                return {
-                    "success": False,
-                    "order_id": order_id,
-                    "status": None,
-                    "message": f"Order {order_id} not found. Please check the order ID and try again.",
-                }
-            try:
-                error_detail = e.response.json().get("detail", str(e))
-            except (ValueError, KeyError):
-                error_detail = str(e)
-            return {
-                "success": False,
-                "order_id": order_id,
-                "status": None,
-                "message": f"Error checking order status: {error_detail}",
-            }
-        except httpx.HTTPError as e:
+    client = get_client()
+    try:
+        response = await client.get(f"/orders/{quote(order_id, safe='')}/status")
+        response.raise_for_status()
+        status_data = orjson.loads(response.content)
+
+        order_id, status, customer_name, total_amount, items_count, created_at = _STATUS_FIELDS(status_data)
+
+        status_msg = _STATUS_MESSAGES.get(status, f"Status: {status}")
+
+        message = (
+            f"Order Status for {order_id}:\n"
+            f"{status_msg}\n"
+            f"Customer: {customer_name}\n"
+            f"Items: {items_count} pet(s)\n"
+            f"Total: ${total_amount:.2f}"
+        )
+
+        return {
+            "success": True,
+            "order_id": order_id,
+            "status": status,
+            "message": message,
+            "details": status_data,
+            "created_at": created_at,
+        }
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
             return {
                 "success": False,
                 "order_id": order_id,
                 "status": None,
-                "message": f"Error checking order status: {str(e)}",
+                "message": f"Order {order_id} not found. Please check the order ID and try again.",
             }
+        error_detail = _error_detail(e)
+        return {
+            "success": False,
+            "order_id": order_id,
+            "status": None,
+            "message": f"Error checking order status: {error_detail}",
+        }
+    except httpx.HTTPError as e:
+        return {
+            "success": False,
+            "order_id": order_id,
+            "status": None,
+            "message": f"Error checking order status: {str(e)}",
+        }
 
 
 # Tool definitions for Azure OpenAI function calling
-TOOLS_DEFINITIONS = [
+_TOOLS_DEFINITIONS = [
     {
         "type": "function",
         "function": {
@@ -236,7 +313,7 @@ TOOLS_DEFINITIONS = [
                 "properties": {
                     "pet_type": {
                         "type": "string",
-                        "enum": ["dog", "cat", "bird", "fish", "rabbit", "hamster"],
+                        "enum": sorted(VALID_PET_TYPES),
                         "description": "Filter by type of pet",
                     },
                     "max_price": {"type": "number", "description": "Maximum price in USD"},
@@ -288,10 +365,15 @@ TOOLS_DEFINITIONS = [
     },
 ]
 
+# Exposed read-only: the definitions and tool map are shared by every chat session
+TOOLS_DEFINITIONS = tuple(MappingProxyType(tool) for tool in _TOOLS_DEFINITIONS)
+
 
 # Map function names to actual functions
-TOOLS_MAP = {
-    "browse_pets": browse_pets_tool,
-    "place_order": place_order_tool,
-    "check_order_status": check_order_status_tool,
-}
+TOOLS_MAP = MappingProxyType(
+    {
+        "browse_pets": browse_pets_tool,
+        "place_order": place_order_tool,
+        "check_order_status": check_order_status_tool,
+    }
+)